@@ -1,7 +1,7 @@
 from chess import syzygy
 import chess
 from board.BoardEncoder import BoardEncoder
-from utils import bitarray_to_ndarray
+from utils import bitarray_to_ndarray, dtz_to_eval
 
 class Evaluator:
     def evaluate():  # this should evaluate the position from the perspective of white
@@ -59,12 +59,7 @@ class SyzygyEvaluator(Evaluator):
                 return -1000 * turn_factor
         
 
-        dtz = self.tablebase.probe_dtz(board)
-        if dtz > 0:
-            return (max(101 - dtz, 50)) * turn_factor
-        elif dtz < 0:
-            return (min(-101-dtz, -50)) * turn_factor
-        return 0
+        return dtz_to_eval(self.tablebase.probe_dtz(board)) * turn_factor
 
 
 class SyzygyEvaluator2(Evaluator):
@@ -82,12 +77,7 @@ class SyzygyEvaluator2(Evaluator):
             else:
                 return -1000
 
-        dtz = self.tablebase.probe_dtz(board)
-        if dtz > 0:
-            return max(101 - dtz, 50)
-        elif dtz < 0:
-            return min(-101 - dtz, -50)
-        return 0
+        return dtz_to_eval(self.tablebase.probe_dtz(board))
 
 
     
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import chess
+from chess import syzygy
+import numpy as np
+from board.BoardEncoder import BoardEncoder
+from utils import dtz_to_eval
+
+TABLEBASE_DIR = '../tables/standard/3-4-5'
+DATA_DIR = '../data/positions'
+VALIDATION_DIR = '../data/validation'
+N_SAMPLES = 10000000
+N_VALIDATION_SAMPLES = 20000  # each one takes ~VALIDATION_BUCKETS random draws to find
+VALIDATION_BUCKETS = 100  # 1 in VALIDATION_BUCKETS distinct positions is reserved for validation
+
+N_FEATURES = 1 + 12 * 64 + 64 + 4  # layout produced by BoardEncoder.encode
+
+
+def encode_to_ndarray(board):
+    # Faster equivalent of utils.bitarray_to_ndarray for bulk encoding
+    bits = BoardEncoder.encode(board)
+    return np.unpackbits(np.frombuffer(bits.tobytes(), dtype=np.uint8))[:len(bits)].astype(bool)
+
+
+def put_piece(board, color, piece, check_validity=True):
+    while True:
+        square = np.random.randint(0, 64)
+        while board.piece_at(square) is not None:
+            square = np.random.randint(0, 64)
+        board.set_piece_at(square, chess.Piece(piece, color))
+        if board.is_valid() or not check_validity:
+            break
+        else:
+            board.remove_piece_at(square)
+
+
+PIECE_SETS = [
+    {chess.WHITE: {chess.QUEEN: 1, chess.PAWN: 0}, chess.BLACK: {chess.QUEEN: 0, chess.PAWN: 0}},
+    {chess.WHITE: {chess.QUEEN: 0, chess.PAWN: 1}, chess.BLACK: {chess.QUEEN: 0, chess.PAWN: 0}},
+    {chess.WHITE: {chess.QUEEN: 0, chess.PAWN: 0}, chess.BLACK: {chess.QUEEN: 1, chess.PAWN: 0}},
+    {chess.WHITE: {chess.QUEEN: 0, chess.PAWN: 0}, chess.BLACK: {chess.QUEEN: 0, chess.PAWN: 1}},
+]
+
+
+def generate_random_board(piece_sets=PIECE_SETS):
+    # Random position with both kings and one of piece_sets added on top
+    board = chess.Board()
+    board.clear_board()
+    board.castling_rights = 0
+    board.turn = chess.WHITE if np.random.randint(0, 2) == 0 else chess.BLACK
+
+    # Put kings first because positions without them are illegal
+    put_piece(board, chess.WHITE, chess.KING, check_validity=False)
+    put_piece(board, chess.BLACK, chess.KING, check_validity=True)
+
+    color_piece_count = piece_sets[np.random.randint(0, len(piece_sets))]
+    for color in chess.COLORS:
+        for piece, count in color_piece_count[color].items():
+            for _ in range(count):
+                put_piece(board, color, piece)
+    return board
+
+
+def is_validation_position(board):
+    # Random draws repeat positions often, so the split is made by position rather than by draw:
+    # a position is always on the same side of it, whichever run or chunk it was drawn in.
+    # EPD holds the placement, side to move, castling and en passant, i.e. everything BoardEncoder encodes.
+    digest = hashlib.sha1(board.epd().encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % VALIDATION_BUCKETS == 0
+
+
+def generate_chunk(tablebase, chunk_size, piece_sets=PIECE_SETS, validation=False):
+    X = np.empty((chunk_size, N_FEATURES), dtype=bool)
+    y = np.empty(chunk_size, dtype=np.float32)
+    for i in range(chunk_size):
+        board = generate_random_board(piece_sets)
+        while is_validation_position(board) != validation:
+            board = generate_random_board(piece_sets)
+        X[i] = encode_to_ndarray(board)
+        y[i] = dtz_to_eval(tablebase.probe_dtz(board))
+    return X, y
+
+
+def write_chunks(tablebase, out_dir, n_samples, chunk_size=100000, piece_sets=PIECE_SETS, validation=False):
+    # Labelled positions are written chunk by chunk, so only one chunk is ever held in memory.
+    # Bits are packed 8 per byte, which keeps tens of millions of positions at a few GB on disk.
+    # validation selects which side of the is_validation_position split is written.
+    os.makedirs(out_dir, exist_ok=True)
+    start = next_chunk_index(out_dir)
+    written = 0
+    while written < n_samples:
+        size = min(chunk_size, n_samples - written)
+        X, y = generate_chunk(tablebase, size, piece_sets, validation)
+        path = os.path.join(out_dir, f'chunk-{start:06d}.npz')
+        with open(path, 'xb') as file:  # never overwrite an existing chunk
+            np.savez(file, X=np.packbits(X, axis=1), y=y)
+        written += size
+        start += 1
+        print(f'Wrote {written}/{n_samples} positions ({path})')
+
+
+def chunk_paths(data_dir):
+    return sorted(os.path.join(data_dir, name) for name in os.listdir(data_dir)
+                  if name.startswith('chunk-') and name.endswith('.npz'))
+
+
+def next_chunk_index(data_dir):
+    # One past the highest existing index, so appending after a chunk was deleted doesn't reuse a name
+    indices = [int(os.path.basename(path)[len('chunk-'):-len('.npz')]) for path in chunk_paths(data_dir)]
+    return max(indices) + 1 if indices else 0
+
+
+def read_chunk(path, dtype=bool):
+    # dtype lets the trainer go from the unpacked uint8 bits straight to float32, without a bool copy in between
+    with np.load(path) as data:
+        X = np.unpackbits(data['X'], axis=1, count=N_FEATURES).astype(dtype, copy=False)
+        return X, data['y']
+
+
+def chunk_paths_excluding(data_dir, exclude=()):
+    excluded = {os.path.abspath(path) for path in exclude}
+    return [path for path in chunk_paths(data_dir) if os.path.abspath(path) not in excluded]
+
+
+def read_chunks(data_dir, shuffle=True, exclude=(), dtype=bool):
+    paths = chunk_paths_excluding(data_dir, exclude)
+    if shuffle:
+        np.random.shuffle(paths)
+    for path in paths:
+        yield read_chunk(path, dtype)
+
+
+if __name__ == '__main__':
+    tablebase = syzygy.open_tablebase(TABLEBASE_DIR)
+    if not os.path.isdir(VALIDATION_DIR) or not chunk_paths(VALIDATION_DIR):
+        write_chunks(tablebase, VALIDATION_DIR, N_VALIDATION_SAMPLES, chunk_size=N_VALIDATION_SAMPLES,
+                     validation=True)
+    write_chunks(tablebase, DATA_DIR, N_SAMPLES)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import chess
+import numpy as np
+from board.BoardEncoder import BoardEncoder
+from utils import bitarray_to_ndarray
+from training.dataset import N_FEATURES, encode_to_ndarray, generate_chunk, generate_random_board, \
+    is_validation_position, write_chunks, chunk_paths, read_chunk
+
+
+class FakeTablebase:
+    # Deterministic stand-in for syzygy.Tablebase, so no tablebase files are needed
+    def __init__(self):
+        self.probed = []
+
+    def probe_dtz(self, board):
+        self.probed.append(board.copy())
+        return len(board.piece_map()) - 3
+
+
+def test_encoding():
+    np.random.seed(0)
+    boards = [generate_random_board() for _ in range(100)]
+    # en passant square and all castling rights set
+    boards.append(chess.Board('rnbqkb1r/pp1p1ppp/5n2/2pPp3/2P5/8/PP2PPPP/RNBQKBNR w KQkq e6 0 4'))
+
+    for board in boards:
+        expected = bitarray_to_ndarray(BoardEncoder.encode(board))
+        encoded = encode_to_ndarray(board)
+        assert encoded.shape == (N_FEATURES,)
+        assert np.array_equal(encoded, expected), board.fen()
+
+
+def test_chunk_round_trip():
+    chunk_size = 37
+    with tempfile.TemporaryDirectory() as out_dir:
+        np.random.seed(1)
+        write_chunks(FakeTablebase(), out_dir, 2 * chunk_size, chunk_size=chunk_size)
+        np.random.seed(1)
+        expected = [generate_chunk(FakeTablebase(), chunk_size) for _ in range(2)]
+
+        paths = chunk_paths(out_dir)
+        assert [os.path.basename(path) for path in paths] == ['chunk-000000.npz', 'chunk-000001.npz']
+        for path, (X_expected, y_expected) in zip(paths, expected):
+            X, y = read_chunk(path)
+            assert X.dtype == bool and X.shape == (chunk_size, N_FEATURES)
+            assert np.array_equal(X, X_expected)
+            assert np.array_equal(y, y_expected)
+            X_float, _ = read_chunk(path, np.float32)
+            assert X_float.dtype == np.float32
+            assert np.array_equal(X_float.astype(bool), X_expected)
+
+
+def test_validation_split():
+    np.random.seed(2)
+    for validation in [False, True]:
+        tablebase = FakeTablebase()
+        generate_chunk(tablebase, 20, validation=validation)
+        assert len(tablebase.probed) == 20
+        assert all(is_validation_position(board) == validation for board in tablebase.probed)
+
+    training = FakeTablebase()
+    validation = FakeTablebase()
+    generate_chunk(training, 200)
+    generate_chunk(validation, 20, validation=True)
+    assert not {board.epd() for board in training.probed} & {board.epd() for board in validation.probed}
+
+
+def test():
+    test_encoding()
+    test_chunk_round_trip()
+    test_validation_split()
+    print('Training data encoding and chunk storage work correctly')
+
+
+if __name__ == '__main__':
+    test()
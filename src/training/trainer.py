@@ -0,0 +1,102 @@
+import json
+import os
+import pickle
+import resource
+import sys
+import time
+from datetime import datetime
+import numpy as np
+from sklearn.neural_network import MLPRegressor
+from training.dataset import chunk_paths_excluding, read_chunks, read_chunk, DATA_DIR, VALIDATION_DIR, N_FEATURES
+
+MODELS_DIR = '../models'
+WARM_START_MODEL = None  # e.g. '../models/model-20240109150324.pkl' to continue training it
+N_EPOCHS = 5
+VALIDATION_CHUNK = os.path.join(VALIDATION_DIR, 'chunk-000000.npz')
+
+
+def new_model():
+    # Same architecture as the in-memory models trained in experiments.ipynb
+    return MLPRegressor(hidden_layer_sizes=(100, 100, 100), alpha=0.5)
+
+
+def load_model(load_path):
+    with open(load_path, 'rb') as file:
+        return pickle.load(file)
+
+
+def save_model(model, models_dir=MODELS_DIR, metadata=None):
+    # Same naming scheme as the existing models, so the result can be passed to load_model_evaluator.
+    # A suffix is added instead of failing if a model was already saved within the same second.
+    os.makedirs(models_dir, exist_ok=True)
+    name = f'model-{datetime.now().strftime("%Y%m%d%H%M%S")}'
+    suffix = 0
+    while True:
+        path = os.path.join(models_dir, f'{name}.pkl' if suffix == 0 else f'{name}-{suffix}.pkl')
+        try:
+            with open(path, 'xb') as file:
+                pickle.dump(model, file)
+            break
+        except FileExistsError:
+            suffix += 1
+
+    if metadata is not None:
+        with open(path[:-len('.pkl')] + '.json', 'w') as file:
+            json.dump(metadata, file, indent=2)
+    return path
+
+
+def peak_memory_mb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return max_rss / 1024 ** 2 if sys.platform == 'darwin' else max_rss / 1024
+
+
+def train(data_dir=DATA_DIR, model=None, warm_start_path=None, n_epochs=N_EPOCHS,
+          validation_path=None, models_dir=MODELS_DIR):
+    # Checked up front, otherwise an empty run would crash at the end or save an untrained copy.
+    # validation_path is skipped in case it was put among the training chunks.
+    exclude = [validation_path] if validation_path else []
+    if not os.path.isdir(data_dir) or not chunk_paths_excluding(data_dir, exclude):
+        raise FileNotFoundError(f'No training chunks in {data_dir}, run `python -m training.dataset` first')
+
+    if model is None:
+        model = load_model(warm_start_path) if warm_start_path else new_model()
+
+    validation = None
+    if validation_path:
+        validation = read_chunk(validation_path, np.float32)
+    samples = 0
+
+    for epoch in range(n_epochs):
+        epoch_samples = 0
+        epoch_loss = 0.0
+        start = time.perf_counter()
+        # float32 is kept as is by MLPRegressor; bool would be converted to float64 (8 bytes per feature)
+        for X, y in read_chunks(data_dir, exclude=exclude, dtype=np.float32):
+            order = np.random.permutation(len(y))
+            model.partial_fit(X[order], y[order])
+            epoch_samples += len(y)
+            epoch_loss += model.loss_ * len(y)  # loss_ only covers the last partial_fit call
+
+        elapsed = time.perf_counter() - start
+        samples += epoch_samples
+        print(f'Epoch {epoch + 1}/{n_epochs}: loss {epoch_loss / epoch_samples:.4f}, '
+              f'{epoch_samples / elapsed:.0f} samples/sec, peak memory {peak_memory_mb():.0f} MB')
+        if validation is not None:
+            print(f'Validation R^2: {model.score(*validation):.4f}')
+
+    path = save_model(model, models_dir, metadata={
+        'warm_start_path': warm_start_path,
+        'samples': samples,
+        'n_epochs': n_epochs,
+        'n_features': N_FEATURES,
+        'data_dir': data_dir,
+    })
+    print(f'Model saved to {path}')
+    return model, path
+
+
+if __name__ == '__main__':
+    train(warm_start_path=WARM_START_MODEL,
+          validation_path=VALIDATION_CHUNK if os.path.exists(VALIDATION_CHUNK) else None)
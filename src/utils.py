@@ -9,3 +9,11 @@ def contains_pawn(board):
         if board.pieces(chess.PAWN, color):
             return True
     return False
+
+def dtz_to_eval(dtz):
+    # Maps a Syzygy DTZ (from the side to move's perspective) to an evaluation score
+    if dtz > 0:
+        return max(101 - dtz, 50)
+    elif dtz < 0:
+        return min(-101 - dtz, -50)
+    return 0